@@ -0,0 +1,175 @@
+import os
+import time
+import uuid
+import pickle
+import sqlite3
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+JOBS_DB = os.environ.get("DOCTORY_JOBS_DB", "jobs.sqlite3")
+DEDUPE_SECONDS = 3600          # identical submissions within this window reuse the existing job
+RETENTION_SECONDS = 7 * 86400  # finished jobs older than this are purged at startup
+HEARTBEAT_SECONDS = 15         # how often a process marks itself alive in the owners table
+STALE_SECONDS = 4 * HEARTBEAT_SECONDS
+MAX_RUNTIME_SECONDS = 300      # queued/running jobs older than this are failed so nobody waits on them forever
+
+# Jobs are owned by the process that queued them, not by a JobManager instance,
+# so rebuilding the cached manager never orphans its own in-flight jobs.
+PROCESS_ID = uuid.uuid4().hex
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    dedupe_key TEXT,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    payload BLOB,
+    result BLOB,
+    error TEXT,
+    owner TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_dedupe ON jobs (type, dedupe_key, created_at);
+CREATE TABLE IF NOT EXISTS owners (
+    id TEXT PRIMARY KEY,
+    heartbeat REAL NOT NULL
+);
+"""
+
+_heartbeats = set()
+_heartbeats_lock = threading.Lock()
+
+
+@contextmanager
+def _connect(db_path):
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        with conn: yield conn
+    finally: conn.close()
+
+def _beat(db_path):
+    """Refresh this process's heartbeat and fail jobs that will never finish.
+
+    That is jobs whose owning process has stopped beating, and jobs that have been
+    queued or running for longer than MAX_RUNTIME_SECONDS (e.g. a hung worker).
+    """
+    now = time.time()
+    with _connect(db_path) as conn:
+        conn.execute("INSERT OR REPLACE INTO owners (id, heartbeat) VALUES (?, ?)", (PROCESS_ID, now))
+        conn.execute("UPDATE jobs SET status=?, error=?, payload=NULL, finished_at=? WHERE status IN (?, ?) "
+                     "AND (owner IS NULL OR owner NOT IN (SELECT id FROM owners WHERE heartbeat > ?))",
+                     (FAILED, "Interrupted by server restart", now, QUEUED, RUNNING, now - STALE_SECONDS))
+        conn.execute("UPDATE jobs SET status=?, error=?, payload=NULL, finished_at=? WHERE status IN (?, ?) "
+                     "AND created_at < ?",
+                     (FAILED, "Timed out, please try again", now, QUEUED, RUNNING, now - MAX_RUNTIME_SECONDS))
+        conn.execute("DELETE FROM owners WHERE heartbeat <= ?", (now - STALE_SECONDS,))
+
+def _heartbeat_loop(db_path):
+    while True:
+        time.sleep(HEARTBEAT_SECONDS)
+        try: _beat(db_path)
+        except Exception: logger.exception("Job heartbeat failed")
+
+
+class JobManager:
+    """Runs long analyses on a local worker pool, tracked in a SQLite job table.
+
+    Pages submit a job, keep its ID in session state and poll `get(job_id)`;
+    the work keeps running if the user switches pages. Each job type has its
+    own pool, so its `max_workers` is that type's concurrency limit.
+    """
+
+    def __init__(self, db_path=JOBS_DB):
+        self.db_path = db_path
+        self._handlers = {}
+        self._pools = {}
+        self._submit_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            conn.execute("DELETE FROM jobs WHERE finished_at < ?", (time.time() - RETENTION_SECONDS,))
+        # Jobs left queued/running by a process that is no longer alive will never finish.
+        _beat(db_path)
+        with _heartbeats_lock:
+            if db_path not in _heartbeats:
+                _heartbeats.add(db_path)
+                threading.Thread(target=_heartbeat_loop, args=(db_path,), name="doctory-jobs-heartbeat", daemon=True).start()
+
+    def _connect(self):
+        return _connect(self.db_path)
+
+    def _update(self, job_id, expected_status, **fields):
+        # Only touch the row while it is still in the state this worker left it in,
+        # so a job already failed by _beat is never revived by its stuck worker.
+        cols = ", ".join(f"{k}=?" for k in fields)
+        with self._connect() as conn:
+            cur = conn.execute(f"UPDATE jobs SET {cols} WHERE id=? AND status=?", (*fields.values(), job_id, expected_status))
+        return cur.rowcount > 0
+
+    def register(self, job_type, handler, max_workers=1):
+        """`handler(payload, progress)` returns the job result; `progress(fraction, message)` reports status."""
+        self._handlers[job_type] = handler
+        self._pools[job_type] = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"doctory-{job_type}")
+
+    def submit(self, job_type, payload, dedupe=True, dedupe_salt=None):
+        """Queue a job and return its ID, or the ID of an identical recent job that hasn't failed.
+
+        `dedupe_salt` (e.g. the model version) is mixed into the key so a changed
+        salt never reuses an older job's result.
+        """
+        if job_type not in self._handlers: raise ValueError(f"Unknown job type: {job_type}")
+        blob = pickle.dumps(payload)
+        key = hashlib.sha256(blob + str(dedupe_salt).encode()).hexdigest() if dedupe else None
+        with self._submit_lock:
+            with self._connect() as conn:
+                if key:
+                    row = conn.execute(
+                        "SELECT id FROM jobs WHERE type=? AND dedupe_key=? AND status!=? AND created_at>? "
+                        "ORDER BY created_at DESC LIMIT 1",
+                        (job_type, key, FAILED, time.time() - DEDUPE_SECONDS)).fetchone()
+                    if row: return row["id"]
+                job_id = uuid.uuid4().hex
+                conn.execute("INSERT INTO jobs (id, type, dedupe_key, status, message, payload, owner, created_at) "
+                             "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                             (job_id, job_type, key, QUEUED, "Waiting for a free worker...", blob, PROCESS_ID, time.time()))
+        self._pools[job_type].submit(self._run, job_id)
+        return job_id
+
+    def _run(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT type, payload FROM jobs WHERE id=?", (job_id,)).fetchone()
+        if row is None or not self._update(job_id, QUEUED, status=RUNNING, started_at=time.time(), message="Started"): return
+
+        def progress(fraction, message=None):
+            self._update(job_id, RUNNING, progress=max(0.0, min(float(fraction), 1.0)), message=message)
+
+        try:
+            result = self._handlers[row["type"]](pickle.loads(row["payload"]), progress)
+        except Exception as e:
+            logger.exception("Job %s (%s) failed", job_id, row["type"])
+            self._update(job_id, RUNNING, status=FAILED, error=str(e), payload=None, finished_at=time.time())
+            return
+        self._update(job_id, RUNNING, status=DONE, progress=1.0, message="Done", result=pickle.dumps(result),
+                     payload=None, finished_at=time.time())
+
+    def get(self, job_id):
+        """Job record as a dict (result unpickled), or None for an unknown ID."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT id, type, status, progress, message, result, error, created_at, "
+                               "started_at, finished_at FROM jobs WHERE id=?", (job_id,)).fetchone()
+        if row is None: return None
+        job = dict(row)
+        job["result"] = pickle.loads(job["result"]) if job["result"] is not None else None
+        return job
@@ -0,0 +1,183 @@
+import os
+import time
+import logging
+import threading
+from datetime import datetime
+import joblib
+import numpy as np
+import pandas as pd
+import onnxruntime as ort
+
+logger = logging.getLogger(__name__)
+
+MODEL_DIR = "models/"
+POLL_SECONDS = float(os.environ.get("DOCTORY_MODEL_POLL_SECONDS", "30"))
+
+ONNX_DTYPES = {"tensor(float)": np.float32, "tensor(double)": np.float64,
+               "tensor(int64)": np.int64, "tensor(int32)": np.int32}
+
+
+# --- LOADERS ---
+def _load_onnx(path, in_key, out_key, sess_key):
+    sess = ort.InferenceSession(path)
+    return {sess_key: sess, in_key: sess.get_inputs()[0].name, out_key: sess.get_outputs()[0].name}
+
+def _load_tabular(model_path, scaler_path, model_key, scaler_key):
+    return {model_key: joblib.load(model_path), scaler_key: joblib.load(scaler_path)}
+
+
+# --- WARM-UP ---
+def _warmup_onnx(bundle, sess_key):
+    # Dummy tensor built from the graph's own input spec; symbolic dims become 1.
+    sess = bundle[sess_key]
+    feeds = {}
+    for inp in sess.get_inputs():
+        shape = [d if isinstance(d, int) and d > 0 else 1 for d in inp.shape]
+        feeds[inp.name] = np.zeros(shape, dtype=ONNX_DTYPES.get(inp.type, np.float32))
+    sess.run(None, feeds)
+
+def _warmup_tabular(bundle, model_key, scaler_key):
+    scaler, model = bundle[scaler_key], bundle[model_key]
+    cols = getattr(scaler, "feature_names_in_", None)
+    if cols is not None: dummy = pd.DataFrame(np.zeros((1, len(cols))), columns=cols)
+    else: dummy = np.zeros((1, scaler.n_features_in_))
+    features = scaler.transform(dummy)
+    if hasattr(model, "predict_proba"): model.predict_proba(features)
+    else: model.predict(features)
+
+
+# --- REGISTRY ---
+# Each entry owns a group of keys in the snapshot returned to the pages;
+# a group is swapped as a whole, and only once all of its files have stopped
+# changing (see ModelManager.refresh), so a model never meets a stale scaler.
+MODEL_SPECS = {
+    "pneumonia": {
+        "files": ["best.onnx"],
+        "load": lambda p: _load_onnx(p[0], "pneu_in", "pneu_out", "pneumonia_sess"),
+        "warmup": lambda b: _warmup_onnx(b, "pneumonia_sess"),
+        "keys": ["pneumonia_sess", "pneu_in", "pneu_out"],
+    },
+    "malaria": {
+        "files": ["malaria_model.onnx"],
+        "load": lambda p: _load_onnx(p[0], "mal_in", "mal_out", "malaria_sess"),
+        "warmup": lambda b: _warmup_onnx(b, "malaria_sess"),
+        "keys": ["malaria_sess", "mal_in", "mal_out"],
+    },
+    "diabetes": {
+        "files": ["diabetes_model_package/diabetes_ensemble_model.joblib", "diabetes_model_package/diabetes_scaler.joblib"],
+        "load": lambda p: _load_tabular(p[0], p[1], "diabetes_model", "diabetes_scaler"),
+        "warmup": lambda b: _warmup_tabular(b, "diabetes_model", "diabetes_scaler"),
+        "keys": ["diabetes_model", "diabetes_scaler"],
+    },
+    "heart": {
+        "files": ["HeartRisk_model_package/HeartRisk_model.joblib", "HeartRisk_model_package/HeartRisk_scaler.joblib"],
+        "load": lambda p: _load_tabular(p[0], p[1], "heart_model", "heart_scaler"),
+        "warmup": lambda b: _warmup_tabular(b, "heart_model", "heart_scaler"),
+        "keys": ["heart_model", "heart_scaler"],
+    },
+}
+
+
+class ModelManager:
+    """Loads, warms up and hot-reloads the diagnostic models.
+
+    The models directory is polled for changed artifacts (mtime/size). A change
+    has to be seen unchanged on two polls in a row before it is picked up, so a
+    rollout still writing the second file of a group is not loaded half-done. It is
+    then loaded and warmed in the background thread and only then swapped in,
+    so pages keep serving the previous version until the new one is ready.
+    """
+
+    def __init__(self, model_dir=MODEL_DIR, poll_seconds=POLL_SECONDS, specs=MODEL_SPECS):
+        self.model_dir = model_dir
+        self.poll_seconds = poll_seconds
+        self.specs = specs
+        self._lock = threading.Lock()
+        self._bundles = {}
+        self._status = {name: {"version": None, "load_seconds": None, "warmup_seconds": None,
+                               "loaded_at": None, "error": None} for name in specs}
+        self._signatures = {}
+        self._pending = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _paths(self, name):
+        return [os.path.join(self.model_dir, f) for f in self.specs[name]["files"]]
+
+    def _signature(self, name):
+        try: return tuple((os.stat(p).st_mtime_ns, os.stat(p).st_size) for p in self._paths(name))
+        except OSError: return None
+
+    def _load(self, name, signature):
+        spec = self.specs[name]
+        self._signatures[name] = signature  # remembered even on failure so a broken artifact isn't retried every poll
+        try:
+            t0 = time.perf_counter()
+            bundle = spec["load"](self._paths(name))
+            t1 = time.perf_counter()
+            spec["warmup"](bundle)
+            t2 = time.perf_counter()
+        except Exception as e:
+            logger.exception("Failed to load model '%s'", name)
+            with self._lock: self._status[name]["error"] = str(e)
+            return False
+
+        version = datetime.fromtimestamp(max(m for m, _ in signature) / 1e9).strftime("%Y%m%d-%H%M%S")
+        with self._lock:
+            self._bundles[name] = bundle
+            self._status[name] = {"version": version, "load_seconds": round(t1 - t0, 3),
+                                  "warmup_seconds": round(t2 - t1, 3),
+                                  "loaded_at": datetime.now().isoformat(timespec="seconds"), "error": None}
+        logger.info("Model '%s' version %s ready (load %.2fs, warm-up %.2fs)", name, version, t1 - t0, t2 - t1)
+        return True
+
+    def refresh(self, settle=True):
+        """Reload every model whose artifacts changed and have since settled.
+
+        With settle=False (initial load) changed artifacts are loaded straight away.
+        """
+        changed = []
+        for name in self.specs:
+            sig = self._signature(name)
+            if sig is None:
+                if name not in self._signatures:
+                    self._signatures[name] = None
+                    with self._lock: self._status[name]["error"] = "artifact missing"
+                continue
+            if sig == self._signatures.get(name):
+                self._pending.pop(name, None)
+                continue
+            if settle and self._pending.get(name) != sig:
+                self._pending[name] = sig  # still being written? wait for the next poll
+                continue
+            self._pending.pop(name, None)
+            if self._load(name, sig): changed.append(name)
+        return changed
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_seconds):
+            try: self.refresh()
+            except Exception: logger.exception("Model watcher iteration failed")
+
+    def start(self):
+        """Initial synchronous load + warm-up, then start the background watcher."""
+        self.refresh(settle=False)
+        if self.poll_seconds > 0 and self._thread is None:
+            self._thread = threading.Thread(target=self._watch, name="doctory-model-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def snapshot(self):
+        """Flat dict in the shape the pages expect; missing models map to None."""
+        with self._lock: bundles = dict(self._bundles)
+        models = {}
+        for name, spec in self.specs.items():
+            bundle = bundles.get(name, {})
+            for key in spec["keys"]: models[key] = bundle.get(key)
+        return models
+
+    def status(self):
+        with self._lock: return {name: dict(s) for name, s in self._status.items()}
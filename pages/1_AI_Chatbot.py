@@ -1,5 +1,5 @@
 import streamlit as st
-from utils import ask_medbot, load_css, MEDICAL_PROMPT, render_sidebar
+from utils import load_css, render_sidebar, submit_job, poll_job
 
 # --- Page Config ---
 st.set_page_config(page_title="Chat with Doctory", page_icon="💬", layout="wide")
@@ -24,6 +24,7 @@ if "messages" not in st.session_state:
 with st.sidebar:
     if st.button("🗑️ Clear Chat History", use_container_width=True):
         st.session_state.messages = [{"role": "assistant", "content": "Hello! I am Doctory. How can I assist you today?"}]
+        st.session_state.pop("chat_job", None)
         st.rerun()
 
 # --- Display Chat ---
@@ -32,15 +33,25 @@ for msg in st.session_state.messages:
         st.write(msg["content"])
 
 # --- User Input ---
-if prompt := st.chat_input("Type your health question here..."):
+# One question at a time: the input is disabled until the pending reply arrives
+pending = "chat_job" in st.session_state
+if prompt := st.chat_input("Type your health question here...", disabled=pending):
+    if pending:
+        st.toast("Please wait for Dr. AI to answer your previous question.")
+        st.stop()
     # User message
     st.session_state.messages.append({"role": "user", "content": prompt})
     with st.chat_message("user"):
         st.write(prompt)
-    
-    # AI Response
+    # Answered in the background so the reply isn't lost when switching pages
+    submit_job("chat", {"prompt": prompt}, "chat_job", dedupe=False)
+
+# --- AI Response ---
+if "chat_job" in st.session_state:
     with st.chat_message("assistant"):
-        with st.spinner("Dr. AI is thinking..."):
-            reply = ask_medbot(prompt, MEDICAL_PROMPT)
+        job = poll_job("chat_job")
+        if job:
+            reply = job["result"]["reply"] if job["status"] == "done" else f"Error: {job['error']}"
             st.write(reply)
             st.session_state.messages.append({"role": "assistant", "content": reply})
+            del st.session_state["chat_job"]
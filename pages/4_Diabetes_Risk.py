@@ -1,10 +1,9 @@
 import streamlit as st
-from utils import load_css, load_all_models, prepare_diabetes_features, calculate_bmi, ask_medbot, MEDICAL_PROMPT, render_sidebar
+from utils import load_css, calculate_bmi, render_sidebar, submit_job, poll_job
 
 st.set_page_config(page_title="Diabetes Risk", page_icon="🩸", layout="wide")
 load_css()
 render_sidebar("Diabetes")
-MODELS = load_all_models()
 
 st.title("🩸 Diabetes Risk Assessment")
 st.markdown("Fill in the clinical data below to estimate the risk.")
@@ -35,33 +34,28 @@ with st.form("diabetes_form"):
 
 # --- Result Section ---
 if submit_btn:
-    if MODELS:
-        try:
-            bmi = calculate_bmi(height, weight)
-            data = {'Age': age, 'Glucose': glucose, 'BP': bp, 'Pregnancies': pregnancies, 'BMI': bmi}
-            
-            # Prediction
-            features = prepare_diabetes_features(data, MODELS['diabetes_scaler'])
-            prediction = MODELS['diabetes_model'].predict(features)[0]
-            
-            # Display
-            st.divider()
-            r_col1, r_col2 = st.columns([1, 2])
-            
-            with r_col1:
-                st.metric("Calculated BMI", f"{bmi:.1f}")
-                if prediction == 1:
-                    st.error("## Result: Diabetic")
-                    st.write("⚠️ High likelihood of Diabetes.")
-                else:
-                    st.success("## Result: Healthy")
-                    st.write("✅ Metrics are within normal range.")
-            
-            with r_col2:
-                with st.spinner("Generating medical advice..."):
-                    result_text = "Diabetic" if prediction == 1 else "Healthy"
-                    ai_exp = ask_medbot(f"Diabetes Check: {result_text}. Glucose: {glucose}, BMI: {bmi:.1f}, BP: {bp}. Advice?", MEDICAL_PROMPT)
-                    st.info(f"👨‍⚕️ **Dr. AI Advice:**\n\n{ai_exp}")
+    bmi = calculate_bmi(height, weight)
+    data = {'Age': age, 'Glucose': glucose, 'BP': bp, 'Pregnancies': pregnancies, 'BMI': bmi}
+    submit_job("diabetes", data, "diabetes_job")
 
-        except Exception as e:
-            st.error(f"Error: {e}")
+job = poll_job("diabetes_job")
+if job and job["status"] == "failed":
+    st.error(f"Error: {job['error']}")
+elif job:
+    res = job["result"]
+    
+    # Display
+    st.divider()
+    r_col1, r_col2 = st.columns([1, 2])
+    
+    with r_col1:
+        st.metric("Calculated BMI", f"{res['bmi']:.1f}")
+        if res["prediction"] == 1:
+            st.error("## Result: Diabetic")
+            st.write("⚠️ High likelihood of Diabetes.")
+        else:
+            st.success("## Result: Healthy")
+            st.write("✅ Metrics are within normal range.")
+    
+    with r_col2:
+        st.info(f"👨‍⚕️ **Dr. AI Advice:**\n\n{res['advice']}")
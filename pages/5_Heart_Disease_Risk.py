@@ -1,6 +1,6 @@
 import streamlit as st
 import pandas as pd
-from utils import load_css, load_all_models, ask_medbot, MEDICAL_PROMPT, render_sidebar
+from utils import load_css, load_all_models, render_sidebar, submit_job, poll_job
 
 # --- Config & Helpers ---
 st.set_page_config(page_title="Heart Risk", page_icon="❤️", layout="wide")
@@ -76,37 +76,32 @@ if submitted:
         'Vegetables_Consumption': vegetables, 'FriedPotato_Consumption': fried_potato,
     }
     
-    with st.spinner('Calculating risk factors...'):
-        try:
-            # Prepare & Predict
-            # NOTE: Ensure prepare_heart_features handles Skin_Cancer/Other_Cancer if added to inputs
-            features = prepare_heart_features(data) 
-            prob = MODELS['heart_model'].predict_proba(features)[0][1]
-            risk_percent = prob * 100
-            
-            # UI Display
-            st.divider()
-            
-            col_res, col_ai = st.columns([1, 1.5])
-            
-            with col_res:
-                st.subheader("Risk Score")
-                if risk_percent > 50:
-                    st.error(f"High Risk: {risk_percent:.1f}%")
-                    st.progress(min(int(risk_percent), 100), text="Risk Probability")
-                elif risk_percent > 20:
-                    st.warning(f"Moderate Risk: {risk_percent:.1f}%")
-                    st.progress(min(int(risk_percent), 100), text="Risk Probability")
-                else:
-                    st.success(f"Low Risk: {risk_percent:.1f}%")
-                    st.progress(min(int(risk_percent), 100), text="Risk Probability")
-            
-            with col_ai:
-                st.subheader("Dr. AI Analysis")
-                prediction_label = "High Risk" if prob > 0.5 else "Low Risk"
-                ai_prompt = f"Heart Risk: {prediction_label} ({risk_percent:.1f}%). Age: {age}, Smoking: {smoking}. Advice?"
-                explanation = ask_medbot(ai_prompt, MEDICAL_PROMPT)
-                st.info(explanation)
-                
-        except Exception as e:
-            st.error(f"Prediction failed: {e}")
+    submit_job("heart", data, "heart_job")
+
+job = poll_job("heart_job")
+if job and job["status"] == "failed":
+    st.error(f"Prediction failed: {job['error']}")
+elif job:
+    res = job["result"]
+    risk_percent = res["risk_percent"]
+    
+    # UI Display
+    st.divider()
+    
+    col_res, col_ai = st.columns([1, 1.5])
+    
+    with col_res:
+        st.subheader("Risk Score")
+        if risk_percent > 50:
+            st.error(f"High Risk: {risk_percent:.1f}%")
+            st.progress(min(int(risk_percent), 100), text="Risk Probability")
+        elif risk_percent > 20:
+            st.warning(f"Moderate Risk: {risk_percent:.1f}%")
+            st.progress(min(int(risk_percent), 100), text="Risk Probability")
+        else:
+            st.success(f"Low Risk: {risk_percent:.1f}%")
+            st.progress(min(int(risk_percent), 100), text="Risk Probability")
+    
+    with col_ai:
+        st.subheader("Dr. AI Analysis")
+        st.info(res["explanation"])
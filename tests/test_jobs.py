@@ -0,0 +1,100 @@
+import time
+import sqlite3
+import threading
+import pytest
+import jobs
+from jobs import JobManager, DONE, FAILED, QUEUED, RUNNING
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate(): return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def db(tmp_path):
+    return str(tmp_path / "jobs.sqlite3")
+
+
+def insert_job(db, job_id, status, owner, created_at=None):
+    with sqlite3.connect(db) as conn:
+        conn.execute("INSERT INTO jobs (id, type, status, owner, created_at) VALUES (?, 't', ?, ?, ?)",
+                     (job_id, status, owner, time.time() if created_at is None else created_at))
+
+
+def test_dedupe_reuses_identical_job_per_salt(db):
+    manager = JobManager(db)
+    calls = []
+    manager.register("t", lambda payload, progress: calls.append(payload) or payload["x"])
+    first = manager.submit("t", {"x": 1}, dedupe_salt="v1")
+    assert wait_for(lambda: manager.get(first)["status"] == DONE)
+
+    assert manager.submit("t", {"x": 1}, dedupe_salt="v1") == first
+    assert manager.submit("t", {"x": 1}, dedupe_salt="v2") != first
+    assert manager.submit("t", {"x": 1}, dedupe=False) != first
+    assert manager.get(first)["result"] == 1
+
+
+def test_failed_job_is_not_reused(db):
+    manager = JobManager(db)
+
+    def handler(payload, progress):
+        raise RuntimeError("LLM down")
+
+    manager.register("t", handler)
+    first = manager.submit("t", {"x": 1})
+    assert wait_for(lambda: manager.get(first)["status"] == FAILED)
+    assert manager.get(first)["error"] == "LLM down"
+    assert manager.submit("t", {"x": 1}) != first
+
+
+def test_pool_limits_concurrency_per_type(db):
+    manager = JobManager(db)
+    release = threading.Event()
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def handler(payload, progress):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        release.wait(5)
+        with lock: running[0] -= 1
+
+    manager.register("t", handler, max_workers=2)
+    ids = [manager.submit("t", {"x": i}) for i in range(4)]
+    assert wait_for(lambda: [manager.get(i)["status"] for i in ids].count(RUNNING) == 2)
+    assert [manager.get(i)["status"] for i in ids].count(QUEUED) == 2
+    release.set()
+    assert wait_for(lambda: all(manager.get(i)["status"] == DONE for i in ids))
+    assert peak[0] == 2
+
+
+def test_beat_fails_only_jobs_of_dead_owners(db):
+    manager = JobManager(db)
+    insert_job(db, "live", RUNNING, jobs.PROCESS_ID)
+    insert_job(db, "dead", RUNNING, "gone")
+    insert_job(db, "legacy", QUEUED, None)
+
+    JobManager(db)  # a second manager on the same database sweeps via _beat
+    assert manager.get("live")["status"] == RUNNING
+    assert manager.get("dead")["status"] == FAILED
+    assert manager.get("legacy")["status"] == FAILED
+
+
+def test_beat_times_out_stuck_job_and_worker_cannot_revive_it(db, monkeypatch):
+    manager = JobManager(db)
+    release = threading.Event()
+    manager.register("t", lambda payload, progress: release.wait(5))
+    job_id = manager.submit("t", {"x": 1})
+    assert wait_for(lambda: manager.get(job_id)["status"] == RUNNING)
+
+    monkeypatch.setattr(jobs, "MAX_RUNTIME_SECONDS", -1)
+    jobs._beat(db)
+    assert manager.get(job_id)["status"] == FAILED
+    release.set()
+    time.sleep(0.2)
+    assert manager.get(job_id)["status"] == FAILED
+    assert manager.submit("t", {"x": 1}) != job_id
@@ -0,0 +1,63 @@
+import os
+import pytest
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("joblib")
+
+from model_manager import ModelManager
+
+
+def load(paths):
+    with open(paths[0]) as f: content = f.read()
+    if content == "broken": raise ValueError("corrupt artifact")
+    return {"model": content}
+
+SPECS = {"m": {"files": ["m.bin"], "load": load, "warmup": lambda bundle: None, "keys": ["model"]}}
+
+
+def write(tmp_path, content, mtime):
+    path = tmp_path / "m.bin"
+    path.write_text(content)
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def manager(tmp_path):
+    write(tmp_path, "v1", 1_000_000)
+    return ModelManager(str(tmp_path), poll_seconds=0, specs=SPECS).start()
+
+
+def test_initial_load_is_immediate(manager):
+    assert manager.snapshot() == {"model": "v1"}
+    status = manager.status()["m"]
+    assert status["version"] and status["error"] is None
+
+
+def test_change_needs_two_identical_polls(manager, tmp_path):
+    write(tmp_path, "v2", 2_000_000)
+    assert manager.refresh() == []
+    assert manager.snapshot() == {"model": "v1"}
+
+    # Still being written: the signature changed again, so the wait starts over.
+    write(tmp_path, "v2-final", 3_000_000)
+    assert manager.refresh() == []
+    assert manager.refresh() == ["m"]
+    assert manager.snapshot() == {"model": "v2-final"}
+
+
+def test_settle_false_loads_change_at_once(manager, tmp_path):
+    write(tmp_path, "v2", 2_000_000)
+    assert manager.refresh(settle=False) == ["m"]
+    assert manager.snapshot() == {"model": "v2"}
+
+
+def test_failed_load_keeps_previous_bundle(manager, tmp_path):
+    version = manager.status()["m"]["version"]
+    write(tmp_path, "broken", 2_000_000)
+    manager.refresh()
+    assert manager.refresh() == []
+    assert manager.snapshot() == {"model": "v1"}
+    status = manager.status()["m"]
+    assert status["error"] == "corrupt artifact"
+    assert status["version"] == version
+    assert manager.refresh() == []  # a broken artifact is not retried until it changes again